@@ -8,9 +8,11 @@ Section 11 of the implementation plan with diagnostic plots and artifacts.
 """
 
 import argparse
+import functools
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
 
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
 import mlflow
 import mlflow.pyfunc
@@ -19,7 +21,28 @@ import mlflow.xgboost
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+from joblib import Parallel, delayed
+from matplotlib.figure import Figure
+
+# Shared savefig options for the evaluation plots. Figures already go through
+# tight_layout(), so bbox_inches='tight' only added a second render pass; a low
+# zlib level keeps PNG encoding cheap at the artifact resolution.
+_SAVEFIG_KW = dict(dpi=300, pil_kwargs={"compress_level": 1})
+
+
+@functools.lru_cache(maxsize=4)
+def _get_mlflow_client(
+    tracking_uri: str,
+    registry_uri: str
+) -> mlflow.tracking.MlflowClient:
+    """Return a cached MlflowClient for the given tracking and registry URIs.
+
+    MlflowClient resolves both URIs once at construction, so the cache is keyed
+    on the pair; a later set_tracking_uri() or set_registry_uri() gets a fresh
+    client that matches what mlflow.pyfunc.load_model() will read.
+    """
+    from mlflow.tracking import MlflowClient
+    return MlflowClient(tracking_uri=tracking_uri, registry_uri=registry_uri)
 
 
 def load_model_from_registry(
@@ -49,8 +72,9 @@ def load_model_from_registry(
         model = mlflow.pyfunc.load_model(model_uri)
 
         # Get model metadata
-        from mlflow.tracking import MlflowClient
-        client = MlflowClient()
+        client = _get_mlflow_client(
+            mlflow.get_tracking_uri(), mlflow.get_registry_uri()
+        )
 
         if isinstance(version, str) and version in ["latest", "Production", "Staging"]:
             # Get latest version or by stage
@@ -103,8 +127,9 @@ def promote_model_to_stage(
         RuntimeError: If promotion fails
     """
     try:
-        from mlflow.tracking import MlflowClient
-        client = MlflowClient()
+        client = _get_mlflow_client(
+            mlflow.get_tracking_uri(), mlflow.get_registry_uri()
+        )
 
         # Transition model version to new stage
         client.transition_model_version_stage(
@@ -145,8 +170,9 @@ def add_model_tags(
         RuntimeError: If tagging fails
     """
     try:
-        from mlflow.tracking import MlflowClient
-        client = MlflowClient()
+        client = _get_mlflow_client(
+            mlflow.get_tracking_uri(), mlflow.get_registry_uri()
+        )
 
         for key, value in tags.items():
             client.set_model_version_tag(
@@ -178,8 +204,11 @@ def calculate_pinball_loss(
     Returns:
         Pinball loss value
     """
-    errors = y_true - y_pred
-    return np.mean(np.maximum(quantile * errors, (quantile - 1) * errors))
+    errors = np.asarray(y_true, dtype=np.float64) - np.asarray(y_pred, dtype=np.float64)
+    if quantile == 0.5:
+        # The median case is half the mean absolute error
+        return 0.5 * float(np.abs(errors).mean())
+    return float(np.maximum(quantile * errors, (quantile - 1.0) * errors).mean())
 
 
 def evaluate_model_performance(
@@ -199,26 +228,50 @@ def evaluate_model_performance(
 
     Returns:
         Dictionary of evaluation metrics including MAE, RMSE, MAPE, Pinball loss
+
+    Raises:
+        ValueError: If y_true and y_pred have different lengths
     """
+    # Flatten so (n, 1) arrays and single-column frames from predict() do not
+    # broadcast against the (n,) targets
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    y_pred = np.asarray(y_pred, dtype=np.float64).ravel()
+    if y_true.size != y_pred.size:
+        raise ValueError(
+            f"y_true and y_pred lengths differ: {y_true.size} != {y_pred.size}"
+        )
+
+    # Shared intermediates: every metric below is derived from these arrays
+    # instead of recomputing y_true - y_pred per metric
+    errors = y_true - y_pred
+    abs_errors = np.abs(errors)
+    y_mean = y_true.mean()
+    ss_res = np.dot(errors, errors)
+
     # Core metrics from implementation plan
-    mae = mean_absolute_error(y_true, y_pred)
-    rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+    mae = abs_errors.mean()
+    rmse = np.sqrt(ss_res / errors.size)
 
-    # MAPE with protection against division by zero
-    mape = np.mean(np.abs((y_true - y_pred) / np.clip(np.abs(y_true), 1e-6, None))) * 100
+    # MAPE over non-zero actuals only; zero-demand points have no defined
+    # percentage error and would otherwise dominate the mean
+    nonzero = y_true != 0
+    if nonzero.any():
+        mape = np.mean(abs_errors[nonzero] / np.abs(y_true[nonzero])) * 100
+    else:
+        mape = 0.0
 
     # R² score
-    ss_res = np.sum((y_true - y_pred) ** 2)
-    ss_tot = np.sum((y_true - np.mean(y_true)) ** 2)
+    centered = y_true - y_mean
+    ss_tot = np.dot(centered, centered)
     r2 = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0.0
 
     # Additional diagnostic metrics
-    max_error = np.max(np.abs(y_true - y_pred))
-    median_ae = np.median(np.abs(y_true - y_pred))
+    max_error = abs_errors.max()
+    median_ae = np.median(abs_errors)
 
-    # Bias metrics
-    bias = np.mean(y_pred - y_true)
-    bias_pct = (bias / np.mean(y_true)) * 100 if np.mean(y_true) != 0 else 0.0
+    # Bias metrics (mean of y_pred - y_true, i.e. the negated mean error)
+    bias = -errors.mean()
+    bias_pct = (bias / y_mean) * 100 if y_mean != 0 else 0.0
 
     metrics = {
         f"{model_name}_mae": float(mae),
@@ -240,31 +293,71 @@ def evaluate_model_performance(
     return metrics
 
 
+def _save_figure(
+    fig: Figure,
+    output_dir: Union[str, Path, BinaryIO],
+    filename: str
+) -> Union[str, BinaryIO]:
+    """Write fig as PNG to output_dir/filename, or straight into a file object."""
+    if hasattr(output_dir, 'write'):
+        fig.savefig(output_dir, format='png', **_SAVEFIG_KW)
+        return output_dir
+
+    plot_path = Path(output_dir) / filename
+    fig.savefig(plot_path, **_SAVEFIG_KW)
+    return str(plot_path)
+
+
+def _compute_residuals(
+    y_true: np.ndarray,
+    predictions: Dict[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """Residuals (actual - predicted) for each model."""
+    return {model_name: y_true - y_pred for model_name, y_pred in predictions.items()}
+
+
+def _as_plot_array(values: np.ndarray) -> np.ndarray:
+    """Downcast values to float32 for drawing; metrics stay on the float64 inputs."""
+    return np.asarray(values, dtype=np.float32)
+
+
 def create_pred_vs_actual_plot(
     y_true: np.ndarray,
     predictions: Dict[str, np.ndarray],
-    output_dir: str
-) -> str:
+    output_dir: Union[str, Path, BinaryIO],
+    residuals: Optional[Dict[str, np.ndarray]] = None
+) -> Union[str, BinaryIO]:
     """
     Create prediction vs actual scatter plot per Section 11.
 
     Args:
         y_true: True values
         predictions: Dictionary of model predictions
-        output_dir: Directory to save plots
+        output_dir: Directory to save plots, or a binary file object to write the PNG to
+        residuals: Optional precomputed residuals per model; computed if omitted
 
     Returns:
-        Path to saved plot
+        Path to saved plot, or the file object it was written to
     """
-    fig, axes = plt.subplots(1, len(predictions), figsize=(5*len(predictions), 5))
+    if residuals is None:
+        residuals = _compute_residuals(y_true, predictions)
+
+    # Build the figure directly rather than through pyplot so it is not
+    # registered with the global figure manager and needs no plt.close()
+    fig = Figure(figsize=(5*len(predictions), 5))
+    axes = fig.subplots(1, len(predictions))
     if len(predictions) == 1:
         axes = [axes]
 
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
+    y_true_plot = _as_plot_array(y_true)
+    centered = y_true - np.mean(y_true)
+    ss_tot = np.dot(centered, centered)
 
     for i, (model_name, y_pred) in enumerate(predictions.items()):
         ax = axes[i]
-        ax.scatter(y_true, y_pred, alpha=0.6, color=colors[i % len(colors)], s=20)
+        ax.scatter(y_true_plot, _as_plot_array(y_pred), alpha=0.6, color=colors[i % len(colors)], s=20,
+                   rasterized=True)
 
         # Perfect prediction line
         min_val = min(y_true.min(), y_pred.min())
@@ -277,50 +370,57 @@ def create_pred_vs_actual_plot(
         ax.grid(True, alpha=0.3)
 
         # Add R² and MAE to plot
-        r2 = 1 - np.sum((y_true - y_pred)**2) / np.sum((y_true - np.mean(y_true))**2)
-        mae = mean_absolute_error(y_true, y_pred)
+        errors = residuals[model_name]
+        r2 = 1 - np.dot(errors, errors) / ss_tot if ss_tot > 0 else 0.0
+        mae = np.abs(errors).mean()
         ax.text(0.05, 0.95, f'R² = {r2:.3f}\nMAE = {mae:.1f}',
                 transform=ax.transAxes, fontsize=11,
                 bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
 
-    plt.tight_layout()
-    plot_path = Path(output_dir) / "pred_vs_actual.png"
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    plt.close()
-
-    return str(plot_path)
+    fig.tight_layout()
+    return _save_figure(fig, output_dir, "pred_vs_actual.png")
 
 
 def create_residual_histogram(
     y_true: np.ndarray,
     predictions: Dict[str, np.ndarray],
-    output_dir: str
-) -> str:
+    output_dir: Union[str, Path, BinaryIO],
+    residuals: Optional[Dict[str, np.ndarray]] = None
+) -> Union[str, BinaryIO]:
     """
     Create residual histogram per Section 11.
 
     Args:
         y_true: True values
         predictions: Dictionary of model predictions
-        output_dir: Directory to save plots
+        output_dir: Directory to save plots, or a binary file object to write the PNG to
+        residuals: Optional precomputed residuals per model; computed if omitted
 
     Returns:
-        Path to saved plot
+        Path to saved plot, or the file object it was written to
     """
-    fig, ax = plt.subplots(figsize=(12, 6))
+    if residuals is None:
+        residuals = _compute_residuals(y_true, predictions)
+
+    fig = Figure(figsize=(12, 6))
+    ax = fig.subplots()
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
 
-    for i, (model_name, y_pred) in enumerate(predictions.items()):
-        residuals = y_true - y_pred
-        ax.hist(residuals, bins=50, alpha=0.7, label=model_name,
-               color=colors[i % len(colors)], density=True, edgecolor='black', linewidth=0.5)
+    for i, model_name in enumerate(predictions):
+        model_residuals = residuals[model_name]
+        # Bin once with numpy and draw the bars directly instead of going
+        # through ax.hist's per-call binning and patch bookkeeping
+        density, edges = np.histogram(_as_plot_array(model_residuals), bins=50, density=True)
+        ax.bar(edges[:-1], density, width=np.diff(edges), align='edge', alpha=0.7,
+               label=model_name, color=colors[i % len(colors)],
+               edgecolor='black', linewidth=0.5)
 
         # Add vertical line at zero
         ax.axvline(0, color='red', linestyle='--', alpha=0.8, linewidth=2)
 
         # Add statistics text
-        mean_resid = np.mean(residuals)
-        std_resid = np.std(residuals)
+        mean_resid = np.mean(model_residuals)
+        std_resid = np.std(model_residuals)
         ax.text(0.02 + i*0.15, 0.95 - i*0.05,
                 f'{model_name}:\nMean: {mean_resid:.1f}\nStd: {std_resid:.1f}',
                 transform=ax.transAxes, fontsize=10,
@@ -332,12 +432,8 @@ def create_residual_histogram(
     ax.legend(fontsize=11)
     ax.grid(True, alpha=0.3)
 
-    plt.tight_layout()
-    plot_path = Path(output_dir) / "residual_hist.png"
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    plt.close()
-
-    return str(plot_path)
+    fig.tight_layout()
+    return _save_figure(fig, output_dir, "residual_hist.png")
 
 
 def create_backtest_chart(
@@ -345,8 +441,8 @@ def create_backtest_chart(
     predictions: Dict[str, np.ndarray],
     timestamps: pd.Series,
     horizon: int,
-    output_dir: str
-) -> str:
+    output_dir: Union[str, Path, BinaryIO]
+) -> Union[str, BinaryIO]:
     """
     Create backtest chart by horizon per Section 11.
 
@@ -355,22 +451,28 @@ def create_backtest_chart(
         predictions: Dictionary of model predictions
         timestamps: Timestamps for time series
         horizon: Forecast horizon in hours
-        output_dir: Directory to save plots
+        output_dir: Directory to save plots, or a binary file object to write the PNG to
 
     Returns:
-        Path to saved plot
+        Path to saved plot, or the file object it was written to
     """
-    fig, ax = plt.subplots(figsize=(15, 8))
+    fig = Figure(figsize=(15, 8))
+    ax = fig.subplots()
     colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
 
+    # Convert timestamps to matplotlib date numbers once, rather than letting
+    # the date converter re-process them for every line
+    x = mdates.date2num(pd.to_datetime(timestamps).to_numpy())
+
     # Plot actual values
-    ax.plot(timestamps, y_true, label='Actual', color='black', linewidth=2, alpha=0.8)
+    ax.plot(x, _as_plot_array(y_true), label='Actual', color='black', linewidth=2, alpha=0.8)
 
     # Plot predictions
     for i, (model_name, y_pred) in enumerate(predictions.items()):
-        ax.plot(timestamps, y_pred, label=f'{model_name} (h={horizon})',
+        ax.plot(x, _as_plot_array(y_pred), label=f'{model_name} (h={horizon})',
                color=colors[i % len(colors)], linewidth=1.5, alpha=0.8)
 
+    ax.xaxis_date()
     ax.set_xlabel('Time', fontsize=12)
     ax.set_ylabel('Load (MW)', fontsize=12)
     ax.set_title(f'Backtest Chart - {horizon}h Horizon', fontsize=14, fontweight='bold')
@@ -378,14 +480,10 @@ def create_backtest_chart(
     ax.grid(True, alpha=0.3)
 
     # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
-
-    plt.tight_layout()
-    plot_path = Path(output_dir) / f"backtest_horizon_{horizon}.png"
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    ax.tick_params(axis='x', labelrotation=45)
 
-    return str(plot_path)
+    fig.tight_layout()
+    return _save_figure(fig, output_dir, f"backtest_horizon_{horizon}.png")
 
 
 def create_evaluation_plots(
@@ -414,12 +512,15 @@ def create_evaluation_plots(
     # Set consistent style
     plt.style.use('seaborn-v0_8')
 
+    # Residuals are shared by the scatter annotations and the histogram
+    residuals = _compute_residuals(y_true, predictions)
+
     # 1. Prediction vs Actual scatter plot (Section 11 requirement)
-    pred_vs_actual_path = create_pred_vs_actual_plot(y_true, predictions, output_dir)
+    pred_vs_actual_path = create_pred_vs_actual_plot(y_true, predictions, output_dir, residuals)
     plot_files.append(pred_vs_actual_path)
 
     # 2. Residual histogram (Section 11 requirement)
-    residual_hist_path = create_residual_histogram(y_true, predictions, output_dir)
+    residual_hist_path = create_residual_histogram(y_true, predictions, output_dir, residuals)
     plot_files.append(residual_hist_path)
 
     # 3. Backtest chart by horizon (Section 11 requirement)
@@ -440,27 +541,35 @@ def create_metrics_comparison(metrics_dict: Dict[str, Dict[str, float]]) -> pd.D
     Returns:
         DataFrame with metrics comparison
     """
-    # Extract model names and metric types
-    all_metrics = {}
-    
-    for model_name, metrics in metrics_dict.items():
-        for metric_name, value in metrics.items():
-            # Remove model prefix from metric name
-            clean_metric = metric_name.replace(f"{model_name}_", "")
-            
-            if clean_metric not in all_metrics:
-                all_metrics[clean_metric] = {}
-            all_metrics[clean_metric][model_name] = value
-    
-    # Create DataFrame
-    comparison_df = pd.DataFrame(all_metrics).T
+    # Strip the model prefix from each metric name; pandas lays the nested
+    # dict out with models as columns and metrics as the index in one pass
+    cleaned = {
+        model_name: {
+            metric_name.removeprefix(f"{model_name}_"): value
+            for metric_name, value in metrics.items()
+        }
+        for model_name, metrics in metrics_dict.items()
+    }
     
     # Round values for better display
-    comparison_df = comparison_df.round(3)
+    comparison_df = pd.DataFrame.from_dict(cleaned).round(3)
     
     return comparison_df
 
 
+def _evaluate_or_none(
+    y_true: np.ndarray,
+    y_pred: np.ndarray,
+    model_name: str
+) -> Optional[Dict[str, float]]:
+    """Evaluate one model, logging and returning None if it fails."""
+    try:
+        return evaluate_model_performance(y_true, y_pred, model_name)
+    except Exception as e:
+        print(f"Failed to evaluate {model_name}: {e}")
+        return None
+
+
 def run_comprehensive_evaluation(
     test_features: pd.DataFrame,
     test_targets: pd.Series,
@@ -488,7 +597,6 @@ def run_comprehensive_evaluation(
     """
     print(f"Running comprehensive evaluation for {len(model_names)} models")
 
-    all_metrics = {}
     predictions = {}
     model_metadata = {}
 
@@ -508,17 +616,6 @@ def run_comprehensive_evaluation(
 
             predictions[model_name] = y_pred
 
-            # Calculate metrics
-            metrics = evaluate_model_performance(
-                test_targets.values, y_pred, model_name
-            )
-            all_metrics[model_name] = metrics
-
-            print(f"  MAE: {metrics[f'{model_name}_mae']:.2f}")
-            print(f"  RMSE: {metrics[f'{model_name}_rmse']:.2f}")
-            print(f"  MAPE: {metrics[f'{model_name}_mape']:.2f}%")
-            print(f"  R²: {metrics[f'{model_name}_r2']:.4f}")
-
         except Exception as e:
             print(f"Failed to evaluate {model_name}: {e}")
             continue
@@ -526,6 +623,31 @@ def run_comprehensive_evaluation(
     if not predictions:
         raise RuntimeError("No models could be evaluated successfully")
 
+    # Calculate metrics for all loaded models; the NumPy reductions release
+    # the GIL, so threads overlap well without pickling the arrays
+    y_true = test_targets.values
+    n_jobs = 1 if len(predictions) == 1 else -1
+    results = Parallel(n_jobs=n_jobs, prefer='threads')(
+        delayed(_evaluate_or_none)(y_true, y_pred, model_name)
+        for model_name, y_pred in predictions.items()
+    )
+    all_metrics = {
+        model_name: metrics
+        for model_name, metrics in zip(predictions, results)
+        if metrics is not None
+    }
+    predictions = {name: predictions[name] for name in all_metrics}
+
+    if not all_metrics:
+        raise RuntimeError("No models could be evaluated successfully")
+
+    for model_name, metrics in all_metrics.items():
+        print(f"\n{model_name}:")
+        print(f"  MAE: {metrics[f'{model_name}_mae']:.2f}")
+        print(f"  RMSE: {metrics[f'{model_name}_rmse']:.2f}")
+        print(f"  MAPE: {metrics[f'{model_name}_mape']:.2f}%")
+        print(f"  R²: {metrics[f'{model_name}_r2']:.4f}")
+
     # Generate diagnostic plots
     print(f"\nGenerating diagnostic plots...")
     plot_files = create_evaluation_plots(
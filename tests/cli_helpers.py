@@ -0,0 +1,37 @@
+"""CLI test helpers shared by the EgoKit command tests."""
+
+from typing import TYPE_CHECKING
+
+import pytest
+import typer
+
+from egokit.cli import app
+
+if TYPE_CHECKING:
+    from click.testing import Result
+
+# Click command tree behind the Typer app, built once for in-process invocation
+CLI_GROUP = typer.main.get_command(app)
+
+
+def invoke_command(args: list[str], capsys: pytest.CaptureFixture[str]) -> str:
+    """Run the CLI in-process and return its combined stdout and stderr.
+
+    Dispatches through the top-level group, so the app callback runs as it
+    would from the shell. Non-standalone mode returns the code of a
+    ``typer.Exit`` instead of exiting; any non-zero exit fails the test, and
+    other errors propagate.
+    """
+    try:
+        exit_code = CLI_GROUP.main(args=args, prog_name="ego", standalone_mode=False)
+    except SystemExit as exc:
+        exit_code = exc.code
+    captured = capsys.readouterr()
+    output = captured.out + captured.err
+    assert not exit_code, f"CLI exited with code {exit_code}: {output}"
+    return output
+
+
+def assert_cli_ok(result: "Result") -> None:
+    """Assert a CliRunner invocation succeeded, showing its output if not."""
+    assert result.exit_code == 0, f"CLI failed: {result.output}"
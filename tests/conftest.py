@@ -0,0 +1,13 @@
+"""Shared pytest configuration for the test suite."""
+
+import pytest
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Ignore DeprecationWarnings from third-party and app imports.
+
+    Added as an ini-level filter so it also covers warnings raised while test
+    modules are imported at collection time, which module-level
+    ``pytestmark`` filters do not reach.
+    """
+    config.addinivalue_line("filterwarnings", "ignore::DeprecationWarning")
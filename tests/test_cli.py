@@ -11,6 +11,8 @@ from typer.testing import CliRunner
 
 from egokit.cli import app, _discover_registry
 
+from tests.cli_helpers import assert_cli_ok
+
 
 class TestCLI:
     """Test CLI commands."""
@@ -124,7 +126,7 @@ class TestCLI:
                 "--org", "Test Organization"
             ])
             
-            assert result.exit_code == 0
+            assert_cli_ok(result)
             assert "Policy registry initialized" in result.stdout
             
             registry_path = Path(temp_dir) / ".egokit" / "policy-registry"
@@ -151,7 +153,7 @@ class TestCLI:
             "--registry", str(temp_registry)
         ])
         
-        assert result.exit_code == 0
+        assert_cli_ok(result)
         # The apply command defaults to claude agent
         assert "Claude artifacts synced" in result.stdout or "✓" in result.stdout
         
@@ -188,7 +190,7 @@ class TestCLI:
             "--dry-run"
         ])
         
-        assert result.exit_code == 0
+        assert_cli_ok(result)
         assert "Dry run - showing generated content" in result.stdout
         assert "CLAUDE.md:" in result.stdout
         assert ".claude/settings.json:" in result.stdout
@@ -208,7 +210,7 @@ class TestCLI:
                 "export-system-prompt"
             ])
             
-            assert result.exit_code == 0
+            assert_cli_ok(result)
             # Check for key components of the system prompt
             assert "INVIOLABLE ORGANIZATIONAL CONSTITUTION" in result.stdout or "CRITICAL" in result.stdout
             assert "Never commit secrets" in result.stdout
@@ -229,7 +231,7 @@ class TestCLI:
                 "--output", str(output_file)
             ])
             
-            assert result.exit_code == 0
+            assert_cli_ok(result)
             assert "System prompt fragment exported" in result.stdout
             assert output_file.exists()
             
@@ -257,7 +259,7 @@ class TestCLI:
                 "Test prompt for Claude Code"
             ])
             
-            assert result.exit_code == 0
+            assert_cli_ok(result)
             assert "Claude Code output" in result.stdout
             
             # Check subprocess was called with correct arguments
@@ -279,7 +281,7 @@ class TestCLI:
             "--registry", str(temp_registry)
         ])
         
-        assert result.exit_code == 0
+        assert_cli_ok(result)
         assert "EgoKit Policy Doctor" in result.stdout
         assert "Policy Version" in result.stdout
         assert "1.0.0" in result.stdout
@@ -6,23 +6,96 @@ Tests cover synthetic weather generation, API integration fallbacks,
 data validation, and error handling scenarios.
 """
 
+import builtins
+import sys
 import tempfile
-from datetime import datetime, timedelta
 from pathlib import Path
 from unittest.mock import Mock, patch
 import pytest
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 from src.ingest.pull_weather import (
     generate_synthetic_weather_data,
     fetch_noaa_weather_data,
     fetch_meteostat_data,
-    save_weather_data,
-    _fallback_to_synthetic_weather
+    save_weather_data
 )
 
 
+# Canned NOAA CDO payload shared by the mocked API responses
+NOAA_PAYLOAD = {
+    "results": [
+        {"date": "2024-01-01", "datatype": "TMAX", "value": 250},
+        {"date": "2024-01-01", "datatype": "TMIN", "value": 150},
+        {"date": "2024-01-02", "datatype": "TMAX", "value": 280},
+        {"date": "2024-01-02", "datatype": "TMIN", "value": 180},
+    ]
+}
+
+
+# Expected data_source label for the region each weather source stamps on
+# its rows; the API fetchers raise on failure rather than fall back
+EXPECTED_LABELS = {
+    "SYNTHETIC": "generated",
+    "NOAA": "noaa_cdo_api",
+    "METEOSTAT": "meteostat_api",
+}
+
+
+def _assert_source_labels(df: pd.DataFrame, region: str) -> None:
+    """Assert every row carries the region and its expected data_source."""
+    assert df["region"].eq(region).all()
+    assert df["data_source"].eq(EXPECTED_LABELS[region]).all()
+
+
+def _mock_noaa_response(status_code: int) -> Mock:
+    """Build a mocked NOAA API response with the given HTTP status."""
+    mock_response = Mock()
+    mock_response.status_code = status_code
+    mock_response.json.return_value = NOAA_PAYLOAD
+    return mock_response
+
+
+@pytest.fixture
+def noaa_ok_response() -> Mock:
+    """Mocked successful NOAA API response."""
+    return _mock_noaa_response(200)
+
+
+def _load_synthetic() -> pd.DataFrame:
+    """Generated frame from the synthetic source."""
+    return generate_synthetic_weather_data(days=1)
+
+
+def _load_noaa() -> pd.DataFrame:
+    """NOAA frame from a mocked successful API response."""
+    with patch('src.ingest.pull_weather.requests.get', return_value=_mock_noaa_response(200)):
+        return fetch_noaa_weather_data(days=2, api_token="test_token")
+
+
+def _load_meteostat() -> pd.DataFrame:
+    """Meteostat frame from a stubbed meteostat module."""
+    hourly = pd.DataFrame(
+        {'temp': 15.0, 'rhum': 60.0, 'wspd': 5.0},
+        index=pd.date_range('2024-01-01', periods=24, freq='h', name='time'),
+    )
+    meteostat = Mock()
+    meteostat.Hourly.return_value.fetch.return_value = hourly
+    with patch.dict(sys.modules, {'meteostat': meteostat}):
+        return fetch_meteostat_data(days=1)
+
+
+# How to obtain a successfully labelled frame for each EXPECTED_LABELS region
+SOURCE_LOADERS = {
+    "SYNTHETIC": _load_synthetic,
+    "NOAA": _load_noaa,
+    "METEOSTAT": _load_meteostat,
+}
+
+
 class TestSyntheticWeatherData:
     """Test synthetic weather data generation."""
 
@@ -51,10 +124,6 @@ class TestSyntheticWeatherData:
         assert df["humidity"].min() >= 10  # Humidity constraints
         assert df["humidity"].max() <= 95
         assert df["wind_speed"].min() >= 0  # Wind speed non-negative
-        
-        # Check metadata
-        assert all(df["region"] == "SYNTHETIC")
-        assert all(df["data_source"] == "generated")
 
     def test_generate_synthetic_weather_data_patterns(self):
         """Test that synthetic weather data has realistic patterns."""
@@ -78,9 +147,12 @@ class TestSyntheticWeatherData:
         days = 100
         df = generate_synthetic_weather_data(days)
         
-        # Temperature and humidity should be somewhat negatively correlated
-        temp_humidity_corr = df["temp_c"].corr(df["humidity"])
-        assert temp_humidity_corr < 0, "Temperature and humidity should be negatively correlated"
+        # Temperature and humidity should be somewhat negatively correlated;
+        # only the sign matters, so the centered covariance is sufficient
+        temp = df["temp_c"].to_numpy()
+        humidity = df["humidity"].to_numpy()
+        temp_humidity_cov = np.dot(temp - temp.mean(), humidity - humidity.mean())
+        assert temp_humidity_cov < 0, "Temperature and humidity should be negatively correlated"
 
     def test_generate_synthetic_weather_data_reproducibility(self):
         """Test that synthetic weather data generation is reproducible."""
@@ -97,29 +169,13 @@ class TestNOAAIntegration:
 
     def test_fetch_noaa_weather_data_no_token(self):
         """Test NOAA data fetch without API token."""
-        df = fetch_noaa_weather_data(days=1, api_token=None)
-        
-        # Should fallback to synthetic data
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) > 0
-        assert all(df["region"] == "NOAA")
-        assert all(df["data_source"] == "noaa_synthetic_fallback")
+        with pytest.raises(ValueError, match="API token is required"):
+            fetch_noaa_weather_data(days=1, api_token=None)
 
     @patch('src.ingest.pull_weather.requests.get')
-    def test_fetch_noaa_weather_data_success(self, mock_get):
+    def test_fetch_noaa_weather_data_success(self, mock_get, noaa_ok_response):
         """Test successful NOAA data fetch."""
-        # Mock successful API response
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
-            "results": [
-                {"date": "2024-01-01", "datatype": "TMAX", "value": 250},
-                {"date": "2024-01-01", "datatype": "TMIN", "value": 150},
-                {"date": "2024-01-02", "datatype": "TMAX", "value": 280},
-                {"date": "2024-01-02", "datatype": "TMIN", "value": 180},
-            ]
-        }
-        mock_get.return_value = mock_response
+        mock_get.return_value = noaa_ok_response
         
         df = fetch_noaa_weather_data(days=2, api_token="test_token")
         
@@ -128,24 +184,15 @@ class TestNOAAIntegration:
         assert len(df) == 2  # Two days of data
         assert "timestamp" in df.columns
         assert "temp_c" in df.columns
-        assert all(df["region"] == "NOAA")
-        assert all(df["data_source"] == "noaa_cdo_api")
 
+    @pytest.mark.parametrize("status_code", [404, 500, 503])
     @patch('src.ingest.pull_weather.requests.get')
-    def test_fetch_noaa_weather_data_api_failure(self, mock_get):
-        """Test NOAA data fetch with API failure."""
-        # Mock API failure
-        mock_response = Mock()
-        mock_response.status_code = 404
-        mock_get.return_value = mock_response
+    def test_fetch_noaa_weather_data_api_failure(self, mock_get, status_code):
+        """Test NOAA data fetch raises on a non-200 API response."""
+        mock_get.return_value = _mock_noaa_response(status_code)
         
-        df = fetch_noaa_weather_data(days=1, api_token="test_token")
-        
-        # Should fallback to synthetic data
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) > 0
-        assert all(df["region"] == "NOAA")
-        assert all(df["data_source"] == "noaa_synthetic_fallback")
+        with pytest.raises(RuntimeError, match=f"status {status_code}"):
+            fetch_noaa_weather_data(days=1, api_token="test_token")
 
 
 class TestMeteostatIntegration:
@@ -153,72 +200,42 @@ class TestMeteostatIntegration:
 
     def test_fetch_meteostat_data_success(self):
         """Test successful Meteostat data fetch."""
-        with patch('builtins.__import__') as mock_import:
-            # Mock the meteostat module
-            mock_meteostat = Mock()
-            mock_point = Mock()
-            mock_hourly = Mock()
-
-            def import_side_effect(name, *args, **kwargs):
-                if name == 'meteostat':
-                    mock_meteostat.Point = Mock(return_value=mock_point)
-                    mock_meteostat.Hourly = Mock(return_value=mock_hourly)
-                    return mock_meteostat
-                return __import__(name, *args, **kwargs)
-
-            mock_import.side_effect = import_side_effect
-
-            # Mock data
-            test_data = pd.DataFrame({
-                'time': pd.date_range('2024-01-01', periods=24, freq='H'),
-                'temp': [15.0] * 24,
-                'rhum': [60.0] * 24,
-                'wspd': [5.0] * 24
-            })
-            test_data.set_index('time', inplace=True)
-            mock_hourly.fetch.return_value = test_data
-
-            df = fetch_meteostat_data(days=1)
-
-            # Check result
-            assert isinstance(df, pd.DataFrame)
-            assert len(df) == 24  # 24 hours of data
-            assert "timestamp" in df.columns
-            assert "temp_c" in df.columns
-            assert "humidity" in df.columns
-            assert "wind_speed" in df.columns
-            assert all(df["region"] == "METEOSTAT")
-            assert all(df["data_source"] == "meteostat_api")
+        df = _load_meteostat()
+        
+        # Check result
+        assert isinstance(df, pd.DataFrame)
+        assert len(df) == 24  # 24 hours of data
+        assert "timestamp" in df.columns
+        assert "temp_c" in df.columns
+        assert "humidity" in df.columns
+        assert "wind_speed" in df.columns
 
     def test_fetch_meteostat_data_import_error(self):
         """Test Meteostat data fetch when package is not installed."""
-        df = fetch_meteostat_data(days=1)
+        real_import = builtins.__import__
 
-        # Should fallback to synthetic data (since meteostat likely not installed in test env)
-        assert isinstance(df, pd.DataFrame)
-        assert len(df) > 0
-        assert all(df["region"] == "METEOSTAT")
-        assert all(df["data_source"] == "meteostat_synthetic_fallback")
+        def import_side_effect(name, *args, **kwargs):
+            if name == 'meteostat':
+                raise ImportError("No module named 'meteostat'")
+            return real_import(name, *args, **kwargs)
 
+        # Simulate a missing package so the test never reaches the network,
+        # even when meteostat is installed locally
+        with patch('builtins.__import__', side_effect=import_side_effect):
+            with pytest.raises(ImportError, match="pip install meteostat"):
+                fetch_meteostat_data(days=1)
 
-class TestFallbackFunction:
-    """Test fallback to synthetic weather data."""
 
-    def test_fallback_to_synthetic_weather(self):
-        """Test fallback function creates properly labeled synthetic weather data."""
-        region = "TEST_REGION"
-        days = 5
-        
-        df = _fallback_to_synthetic_weather(region, days)
+class TestSourceLabels:
+    """Test the region and data_source labels each source applies."""
+
+    @pytest.mark.parametrize("region", list(EXPECTED_LABELS))
+    def test_source_labels(self, region):
+        """Test every row from a source carries its expected labels."""
+        df = SOURCE_LOADERS[region]()
         
-        assert isinstance(df, pd.DataFrame)
         assert len(df) > 0
-        assert all(df["region"] == region)
-        assert all(df["data_source"] == "test_region_synthetic_fallback")
-        
-        # Should have all required columns
-        expected_cols = {"timestamp", "temp_c", "humidity", "wind_speed", "region", "data_source"}
-        assert set(df.columns) == expected_cols
+        _assert_source_labels(df, region)
 
 
 class TestWeatherDataSaving:
@@ -239,9 +256,11 @@ class TestWeatherDataSaving:
             assert Path(result_path).exists()
             assert result_path == str(output_path)
             
-            # Check file can be read back
-            loaded_df = pd.read_parquet(output_path)
-            pd.testing.assert_frame_equal(df, loaded_df)
+            # Check file can be read back; compare at the Arrow level since
+            # the file was written through pyarrow
+            expected = pa.Table.from_pandas(df, preserve_index=False)
+            actual = pq.read_table(output_path)
+            assert actual.equals(expected)
 
 
 class TestWeatherDataValidation:
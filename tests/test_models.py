@@ -1,7 +1,9 @@
 """Tests for EgoKit data models."""
 
+from typing import Any, Dict, Type
+
 import pytest
-from pydantic import ValidationError
+from pydantic import BaseModel, ValidationError
 
 from egokit.models import (
     EgoCharter,
@@ -9,53 +11,27 @@ from egokit.models import (
     PolicyCharter,
     PolicyRule,
     Severity,
-    ToneConfig,
 )
 
 
-class TestPolicyRule:
-    """Test PolicyRule validation."""
-    
-    def test_valid_rule(self) -> None:
-        """Test creating a valid policy rule."""
-        rule = PolicyRule(
-            id="SEC-001",
-            rule="Never commit secrets",
-            severity=Severity.CRITICAL,
-            detector="secret.regex.v1",
-        )
-        assert rule.id == "SEC-001"
-        assert rule.severity == Severity.CRITICAL
-    
-    def test_invalid_rule_id(self) -> None:
-        """Test invalid rule ID format."""
-        with pytest.raises(ValidationError, match="Rule ID must follow format"):
-            PolicyRule(
-                id="invalid-id",
-                rule="Test rule",
-                severity=Severity.WARNING,
-                detector="test.v1",
-            )
-    
-    def test_invalid_detector_name(self) -> None:
-        """Test invalid detector name format."""
-        with pytest.raises(ValidationError, match="Detector must follow format"):
-            PolicyRule(
-                id="TEST-001",
-                rule="Test rule",
-                severity=Severity.WARNING,
-                detector="invalid_detector_name",
-            )
-
-
-class TestPolicyCharter:
-    """Test PolicyCharter validation."""
-    
-    def test_valid_charter(self) -> None:
-        """Test creating a valid policy charter."""
-        charter = PolicyCharter(
-            version="1.0.0",
-            scopes={
+# (model class, constructor kwargs, expected attribute values by dotted path)
+VALID_MODEL_CASES = [
+    pytest.param(
+        PolicyRule,
+        {
+            "id": "SEC-001",
+            "rule": "Never commit secrets",
+            "severity": Severity.CRITICAL,
+            "detector": "secret.regex.v1",
+        },
+        {"id": "SEC-001", "severity": Severity.CRITICAL},
+        id="policy-rule",
+    ),
+    pytest.param(
+        PolicyCharter,
+        {
+            "version": "1.0.0",
+            "scopes": {
                 "global": {
                     "security": [
                         {
@@ -67,45 +43,91 @@ class TestPolicyCharter:
                     ]
                 }
             },
-        )
-        assert charter.version == "1.0.0"
-    
-    def test_invalid_version(self) -> None:
-        """Test invalid version format."""
-        with pytest.raises(ValidationError, match="Version must follow semantic versioning"):
-            PolicyCharter(
-                version="invalid-version",
-                scopes={},
-            )
+        },
+        {"version": "1.0.0"},
+        id="policy-charter",
+    ),
+    pytest.param(
+        EgoConfig,
+        {
+            "role": "Senior Engineer",
+            "tone": {"voice": "professional", "verbosity": "balanced"},
+        },
+        {"role": "Senior Engineer", "tone.voice": "professional"},
+        id="ego-config",
+    ),
+    pytest.param(
+        EgoCharter,
+        {
+            "version": "1.0.0",
+            "ego": {
+                "role": "Engineer",
+                "tone": {"voice": "professional", "verbosity": "balanced"},
+            },
+        },
+        {"version": "1.0.0", "ego.role": "Engineer"},
+        id="ego-charter",
+    ),
+]
+
+# (model class, constructor kwargs, expected validation error message)
+INVALID_MODEL_CASES = [
+    pytest.param(
+        PolicyRule,
+        {
+            "id": "invalid-id",
+            "rule": "Test rule",
+            "severity": Severity.WARNING,
+            "detector": "test.v1",
+        },
+        "Rule ID must follow format",
+        id="rule-id",
+    ),
+    pytest.param(
+        PolicyRule,
+        {
+            "id": "TEST-001",
+            "rule": "Test rule",
+            "severity": Severity.WARNING,
+            "detector": "invalid_detector_name",
+        },
+        "Detector must follow format",
+        id="detector-name",
+    ),
+    pytest.param(
+        PolicyCharter,
+        {"version": "invalid-version", "scopes": {}},
+        "Version must follow semantic versioning",
+        id="charter-version",
+    ),
+]
+
+
+def _resolve(obj: Any, dotted_path: str) -> Any:
+    """Follow a dotted attribute path such as ``tone.voice`` on obj."""
+    for attr in dotted_path.split("."):
+        obj = getattr(obj, attr)
+    return obj
 
 
-class TestEgoConfig:
-    """Test EgoConfig validation."""
-    
-    def test_valid_ego_config(self) -> None:
-        """Test creating a valid ego configuration."""
-        config = EgoConfig(
-            role="Senior Engineer",
-            tone=ToneConfig(
-                voice="professional",
-                verbosity="balanced",
-            ),
-        )
-        assert config.role == "Senior Engineer"
-        assert config.tone.voice == "professional"
+@pytest.mark.parametrize("model_cls,kwargs,expected", VALID_MODEL_CASES)
+def test_valid_model(
+    model_cls: Type[BaseModel],
+    kwargs: Dict[str, Any],
+    expected: Dict[str, Any],
+) -> None:
+    """Test creating valid models exposes the given field values."""
+    instance = model_cls(**kwargs)
+    for dotted_path, value in expected.items():
+        assert _resolve(instance, dotted_path) == value
 
 
-class TestEgoCharter:
-    """Test EgoCharter validation."""
-    
-    def test_valid_ego_charter(self) -> None:
-        """Test creating a valid ego charter."""
-        charter = EgoCharter(
-            version="1.0.0",
-            ego=EgoConfig(
-                role="Engineer",
-                tone=ToneConfig(voice="professional", verbosity="balanced"),
-            ),
-        )
-        assert charter.version == "1.0.0"
-        assert charter.ego.role == "Engineer"
\ No newline at end of file
+@pytest.mark.parametrize("model_cls,kwargs,message", INVALID_MODEL_CASES)
+def test_invalid_model(
+    model_cls: Type[BaseModel],
+    kwargs: Dict[str, Any],
+    message: str,
+) -> None:
+    """Test invalid field values are rejected with a descriptive error."""
+    with pytest.raises(ValidationError, match=message):
+        model_cls(**kwargs)
@@ -6,9 +6,10 @@ Tests cover Sections 11-12 of implementation plan: comprehensive evaluation,
 diagnostic plots, model registry integration, and promotion workflows.
 """
 
-import tempfile
+import functools
+import io
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, Iterator, List, Tuple
 from unittest.mock import Mock, patch, MagicMock
 import pytest
 import pandas as pd
@@ -26,10 +27,64 @@ from src.models.evaluate import (
     create_metrics_comparison,
     load_model_from_registry,
     promote_model_to_stage,
-    add_model_tags
+    add_model_tags,
+    run_comprehensive_evaluation,
+    _get_mlflow_client
 )
 
 
+@functools.lru_cache(maxsize=4)
+def _seasonal_base(n: int) -> np.ndarray:
+    """Deterministic hourly load shape: base load plus daily and weekly cycles."""
+    t = np.arange(n)
+    base = 1000 + 200 * np.sin(2 * np.pi * t / 24) + 100 * np.sin(2 * np.pi * t / (24 * 7))
+    base.flags.writeable = False  # shared between callers via the cache
+    return base
+
+
+@pytest.fixture
+def rng() -> np.random.Generator:
+    """Freshly seeded generator, so each test's data is independent of order."""
+    return np.random.default_rng(0)
+
+
+@pytest.fixture(scope="module")
+def synthetic_series() -> Tuple[pd.DatetimeIndex, np.ndarray, Dict[str, np.ndarray]]:
+    """Hourly timestamps, actuals and two noisy model predictions."""
+    rng = np.random.default_rng(0)
+    n = 100
+    timestamps = pd.date_range('2024-01-01', periods=n, freq='h')
+    y_true = rng.normal(1000, 200, n)
+    predictions = {
+        "model_1": y_true + rng.normal(0, 50, n),
+        "model_2": y_true + rng.normal(0, 100, n)
+    }
+    return timestamps, y_true, predictions
+
+
+@pytest.fixture(scope="module")
+def plots_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Single temporary directory shared by every plot test in the module."""
+    return tmp_path_factory.mktemp("plots")
+
+
+@pytest.fixture
+def output_dir(plots_dir: Path, request: pytest.FixtureRequest) -> str:
+    """Per-test subdirectory of plots_dir, named after the test."""
+    test_dir = plots_dir / request.node.name
+    test_dir.mkdir(parents=True, exist_ok=True)
+    return str(test_dir)
+
+
+@pytest.fixture
+def mlflow_client(mocker) -> Iterator[Mock]:
+    """Autospecced MlflowClient instance returned by the cached client factory."""
+    _get_mlflow_client.cache_clear()
+    client_class = mocker.patch('mlflow.tracking.MlflowClient', autospec=True)
+    yield client_class.return_value
+    _get_mlflow_client.cache_clear()
+
+
 class TestPinballLoss:
     """Test Pinball loss calculation per Section 11."""
 
@@ -71,6 +126,13 @@ class TestPinballLoss:
         
         assert pinball_10 > pinball_90
 
+    def test_calculate_pinball_loss_median_is_half_mae(self) -> None:
+        """Test the q=0.5 Pinball loss equals half the mean absolute error."""
+        y_true = np.array([100, 200, 150, 180])
+        y_pred = np.array([90, 210, 140, 200])
+        
+        assert calculate_pinball_loss(y_true, y_pred, 0.5) == pytest.approx(0.5 * 12.5)
+
 
 class TestModelPerformanceEvaluation:
     """Test comprehensive model performance evaluation per Section 11."""
@@ -122,6 +184,9 @@ class TestModelPerformanceEvaluation:
         # Should not crash and should return finite values
         assert np.isfinite(metrics["test_model_mape"])
         assert np.isfinite(metrics["test_model_bias_pct"])
+        
+        # Zero actuals are excluded: mean(5/100, 5/200) * 100
+        assert metrics["test_model_mape"] == pytest.approx(3.75)
 
     def test_evaluate_model_performance_perfect_prediction(self) -> None:
         """Test evaluation with perfect predictions."""
@@ -137,71 +202,79 @@ class TestModelPerformanceEvaluation:
         assert metrics["perfect_model_r2"] == 1.0
         assert metrics["perfect_model_bias"] == 0.0
 
+    @pytest.mark.parametrize(
+        "y_pred",
+        [
+            pytest.param(np.array([[95], [195], [145], [175]]), id="column_array"),
+            pytest.param(pd.DataFrame({"prediction": [95, 195, 145, 175]}), id="single_column_frame"),
+        ],
+    )
+    def test_evaluate_model_performance_column_predictions(self, y_pred) -> None:
+        """Test (n, 1) predictions are flattened instead of broadcast."""
+        y_true = np.array([100, 200, 150, 180])
+        
+        metrics = evaluate_model_performance(y_true, y_pred, "test_model")
+        
+        assert metrics["test_model_mae"] == 5.0
+        assert metrics["test_model_rmse"] == 5.0
+
+    def test_evaluate_model_performance_length_mismatch(self) -> None:
+        """Test mismatched prediction length raises a clear error."""
+        with pytest.raises(ValueError, match="lengths differ"):
+            evaluate_model_performance(np.array([100, 200, 150]), np.array([95, 195]), "test_model")
+
 
 class TestDiagnosticPlots:
     """Test diagnostic plot generation per Section 11."""
 
-    def test_create_pred_vs_actual_plot(self) -> None:
+    def test_create_pred_vs_actual_plot(self, synthetic_series) -> None:
         """Test prediction vs actual scatter plot creation."""
-        y_true = np.random.normal(1000, 200, 100)
-        predictions = {
-            "model_1": y_true + np.random.normal(0, 50, 100),
-            "model_2": y_true + np.random.normal(0, 100, 100)
-        }
+        _, y_true, predictions = synthetic_series
+        buf = io.BytesIO()
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            plot_path = create_pred_vs_actual_plot(y_true, predictions, temp_dir)
-            
-            # Check plot file was created
-            assert Path(plot_path).exists()
-            assert plot_path.endswith("pred_vs_actual.png")
+        result = create_pred_vs_actual_plot(y_true, predictions, buf)
+        
+        # Check PNG was written to the buffer
+        assert result is buf
+        assert buf.getvalue().startswith(b"\x89PNG")
+        assert buf.tell() > 1000
 
-    def test_create_residual_histogram(self) -> None:
+    def test_create_residual_histogram(self, synthetic_series) -> None:
         """Test residual histogram creation."""
-        y_true = np.random.normal(1000, 200, 100)
-        predictions = {
-            "model_1": y_true + np.random.normal(0, 50, 100)
-        }
+        _, y_true, predictions = synthetic_series
+        predictions = {"model_1": predictions["model_1"]}
+        buf = io.BytesIO()
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            plot_path = create_residual_histogram(y_true, predictions, temp_dir)
-            
-            # Check plot file was created
-            assert Path(plot_path).exists()
-            assert plot_path.endswith("residual_hist.png")
+        create_residual_histogram(y_true, predictions, buf)
+        
+        # Check PNG was written to the buffer
+        assert buf.getvalue().startswith(b"\x89PNG")
+        assert buf.tell() > 1000
 
-    def test_create_backtest_chart(self) -> None:
+    def test_create_backtest_chart(self, synthetic_series, output_dir) -> None:
         """Test backtest chart creation."""
-        timestamps = pd.date_range('2024-01-01', periods=100, freq='h')
-        y_true = np.random.normal(1000, 200, 100)
-        predictions = {
-            "model_1": y_true + np.random.normal(0, 50, 100)
-        }
+        timestamps, y_true, predictions = synthetic_series
+        predictions = {"model_1": predictions["model_1"]}
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            plot_path = create_backtest_chart(y_true, predictions, timestamps, horizon=1, output_dir=temp_dir)
-            
-            # Check plot file was created
-            assert Path(plot_path).exists()
-            assert "backtest_horizon_1.png" in plot_path
+        plot_path = create_backtest_chart(y_true, predictions, timestamps, horizon=1, output_dir=output_dir)
+        
+        # Check plot file was created
+        assert Path(plot_path).exists()
+        assert "backtest_horizon_1.png" in plot_path
 
-    def test_create_evaluation_plots_comprehensive(self) -> None:
+    def test_create_evaluation_plots_comprehensive(self, synthetic_series, output_dir) -> None:
         """Test comprehensive evaluation plot creation."""
-        timestamps = pd.date_range('2024-01-01', periods=100, freq='h')
-        y_true = np.random.normal(1000, 200, 100)
-        predictions = {
-            "xgb_model": y_true + np.random.normal(0, 50, 100),
-            "lstm_model": y_true + np.random.normal(0, 75, 100)
-        }
+        timestamps, y_true, predictions = synthetic_series
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            plot_files = create_evaluation_plots(y_true, predictions, timestamps, horizon=1, output_dir=temp_dir)
-            
-            # Check all required plots were created
-            assert len(plot_files) == 3  # pred_vs_actual, residual_hist, backtest
-            
-            for plot_file in plot_files:
-                assert Path(plot_file).exists()
+        plot_files = create_evaluation_plots(y_true, predictions, timestamps, horizon=1, output_dir=output_dir)
+        
+        # Check all required plots were created under their expected names
+        assert [Path(plot_file).name for plot_file in plot_files] == [
+            "pred_vs_actual.png", "residual_hist.png", "backtest_horizon_1.png"
+        ]
+        
+        for plot_file in plot_files:
+            assert Path(plot_file).exists()
 
 
 class TestMetricsComparison:
@@ -244,13 +317,8 @@ class TestModelRegistry:
     """Test model registry functionality per Section 12."""
 
     @patch('src.models.evaluate.mlflow.pyfunc.load_model')
-    @patch('mlflow.tracking.MlflowClient')
-    def test_load_model_from_registry_latest(self, mock_client_class: Mock, mock_load_model: Mock) -> None:
+    def test_load_model_from_registry_latest(self, mock_load_model: Mock, mlflow_client: Mock) -> None:
         """Test loading latest model from registry."""
-        # Mock MLflow client
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        
         # Mock model version
         mock_version = Mock()
         mock_version.version = "1"
@@ -259,7 +327,7 @@ class TestModelRegistry:
         mock_version.creation_timestamp = 1234567890
         mock_version.description = "Test model"
         
-        mock_client.get_latest_versions.return_value = [mock_version]
+        mlflow_client.get_latest_versions.return_value = [mock_version]
         
         # Mock loaded model
         mock_model = Mock()
@@ -274,47 +342,59 @@ class TestModelRegistry:
         assert metadata["version"] == "1"
         assert metadata["stage"] == "None"
 
-    @patch('mlflow.tracking.MlflowClient')
-    def test_promote_model_to_stage(self, mock_client_class: Mock) -> None:
+    def test_promote_model_to_stage(self, mlflow_client: Mock) -> None:
         """Test model promotion to stage."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        
-        # Test promotion
         promote_model_to_stage("test_model", "1", "Production", "Test promotion")
         
         # Check client was called correctly
-        mock_client.transition_model_version_stage.assert_called_once_with(
+        mlflow_client.transition_model_version_stage.assert_called_once_with(
             name="test_model",
             version="1",
             stage="Production",
             archive_existing_versions=True
         )
         
-        mock_client.update_model_version.assert_called_once_with(
+        mlflow_client.update_model_version.assert_called_once_with(
             name="test_model",
             version="1",
             description="Test promotion"
         )
 
-    @patch('mlflow.tracking.MlflowClient')
-    def test_add_model_tags(self, mock_client_class: Mock) -> None:
+    def test_add_model_tags(self, mlflow_client: Mock) -> None:
         """Test adding tags to model version."""
-        mock_client = Mock()
-        mock_client_class.return_value = mock_client
-        
         tags = {
             "dataset": "test_dataset",
             "horizon": "1",
             "git_sha": "abc123"
         }
         
-        # Test adding tags
         add_model_tags("test_model", "1", tags)
         
-        # Check client was called for each tag
-        assert mock_client.set_model_version_tag.call_count == 3
-
+        # Check client was called for each tag, in order
+        assert mlflow_client.set_model_version_tag.call_count == 3
+        tagged = [
+            (call.kwargs["key"], call.kwargs["value"])
+            for call in mlflow_client.set_model_version_tag.call_args_list
+        ]
+        assert tagged == list(tags.items())
+
+    def test_mlflow_client_cached_per_tracking_uri(self, mocker) -> None:
+        """Test a new tracking or registry URI gets its own client."""
+        _get_mlflow_client.cache_clear()
+        client_class = mocker.patch('mlflow.tracking.MlflowClient', autospec=True)
+        client_class.side_effect = lambda tracking_uri, registry_uri: Mock(
+            tracking_uri=tracking_uri, registry_uri=registry_uri
+        )
+        
+        first = _get_mlflow_client("file:///tmp/mlruns-a", "file:///tmp/mlruns-a")
+        assert _get_mlflow_client("file:///tmp/mlruns-a", "file:///tmp/mlruns-a") is first
+        new_tracking = _get_mlflow_client("file:///tmp/mlruns-b", "file:///tmp/mlruns-a")
+        new_registry = _get_mlflow_client("file:///tmp/mlruns-a", "sqlite:///registry.db")
+        
+        assert len({id(first), id(new_tracking), id(new_registry)}) == 3
+        assert new_tracking.tracking_uri == "file:///tmp/mlruns-b"
+        assert new_registry.registry_uri == "sqlite:///registry.db"
+        assert client_class.call_count == 3
 
 class TestErrorHandling:
     """Test error handling and edge cases."""
@@ -327,25 +407,28 @@ class TestErrorHandling:
             with pytest.raises(RuntimeError, match="Failed to load model"):
                 load_model_from_registry("nonexistent_model", "latest")
 
-    def test_promote_model_to_stage_failure(self) -> None:
+    def test_promote_model_to_stage_failure(self, mlflow_client: Mock) -> None:
         """Test model promotion failure."""
-        with patch('mlflow.tracking.MlflowClient') as mock_client_class:
-            mock_client = Mock()
-            mock_client_class.return_value = mock_client
-            mock_client.transition_model_version_stage.side_effect = Exception("Promotion failed")
-            
-            with pytest.raises(RuntimeError, match="Failed to promote model"):
-                promote_model_to_stage("test_model", "1", "Production")
+        mlflow_client.transition_model_version_stage.side_effect = Exception("Promotion failed")
+        
+        with pytest.raises(RuntimeError, match="Failed to promote model"):
+            promote_model_to_stage("test_model", "1", "Production")
 
-    def test_add_model_tags_failure(self) -> None:
+    def test_add_model_tags_failure(self, mlflow_client: Mock) -> None:
         """Test adding tags failure."""
-        with patch('mlflow.tracking.MlflowClient') as mock_client_class:
-            mock_client = Mock()
-            mock_client_class.return_value = mock_client
-            mock_client.set_model_version_tag.side_effect = Exception("Tagging failed")
-            
-            with pytest.raises(RuntimeError, match="Failed to add tags"):
-                add_model_tags("test_model", "1", {"test": "tag"})
+        mlflow_client.set_model_version_tag.side_effect = Exception("Tagging failed")
+        
+        with pytest.raises(RuntimeError, match="Failed to add tags"):
+            add_model_tags("test_model", "1", {"test": "tag"})
+
+    def test_add_model_tags_stops_at_first_failure(self, mlflow_client: Mock) -> None:
+        """Test a failing tag stops the remaining tags from being written."""
+        mlflow_client.set_model_version_tag.side_effect = [None, Exception("Tagging failed"), None]
+        
+        with pytest.raises(RuntimeError, match="Failed to add tags"):
+            add_model_tags("test_model", "1", {"dataset": "d", "horizon": "1", "git_sha": "abc"})
+        
+        assert mlflow_client.set_model_version_tag.call_count == 2
 
 
 class TestIntegration:
@@ -367,32 +450,58 @@ class TestIntegration:
         assert abs(metrics["test_model_mae"] - manual_mae) < 1e-10
         assert abs(metrics["test_model_rmse"] - manual_rmse) < 1e-10
 
-    def test_plot_generation_with_real_data(self) -> None:
+    def test_plot_generation_with_real_data(self, rng, output_dir) -> None:
         """Test plot generation with realistic data patterns."""
-        # Generate realistic power demand data
-        timestamps = pd.date_range('2024-01-01', periods=168, freq='h')  # 1 week
-        base_load = 1000
-        daily_pattern = 200 * np.sin(2 * np.pi * np.arange(168) / 24)
-        weekly_pattern = 100 * np.sin(2 * np.pi * np.arange(168) / (24 * 7))
-        noise = np.random.normal(0, 50, 168)
-        
-        y_true = base_load + daily_pattern + weekly_pattern + noise
+        # Generate realistic power demand data (1 week, hourly)
+        timestamps = pd.date_range('2024-01-01', periods=168, freq='h')
+        y_true = _seasonal_base(168) + rng.normal(0, 50, 168)
         
         # Generate predictions with different error patterns
         predictions = {
-            "good_model": y_true + np.random.normal(0, 30, 168),
-            "poor_model": y_true + np.random.normal(50, 80, 168)  # Biased and noisy
+            "good_model": y_true + rng.normal(0, 30, 168),
+            "poor_model": y_true + rng.normal(50, 80, 168)  # Biased and noisy
         }
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            plot_files = create_evaluation_plots(y_true, predictions, timestamps, horizon=1, output_dir=temp_dir)
-            
-            # All plots should be generated successfully
-            assert len(plot_files) == 3
-            for plot_file in plot_files:
-                assert Path(plot_file).exists()
-                # Check file size is reasonable (not empty)
-                assert Path(plot_file).stat().st_size > 1000  # At least 1KB
+        plot_files = create_evaluation_plots(y_true, predictions, timestamps, horizon=1, output_dir=output_dir)
+        
+        # All plots should be generated successfully
+        assert len(plot_files) == 3
+        for plot_file in plot_files:
+            assert Path(plot_file).exists()
+            # Check file size is reasonable (not empty)
+            assert Path(plot_file).stat().st_size > 1000  # At least 1KB
+
+    def test_run_comprehensive_evaluation_skips_failed_model(
+        self, rng, output_dir, mocker, capsys
+    ) -> None:
+        """Test one model failing metrics does not abort the other's evaluation."""
+        n = 48
+        timestamps = pd.Series(pd.date_range('2024-01-01', periods=n, freq='h'))
+        y_true = _seasonal_base(n) + rng.normal(0, 50, n)
+        
+        good_model = Mock()
+        good_model.predict.return_value = y_true + rng.normal(0, 30, n)
+        bad_model = Mock()
+        bad_model.predict.return_value = y_true[:-1]  # wrong length
+        models = {"good_model": good_model, "bad_model": bad_model}
+        
+        mocker.patch(
+            'src.models.evaluate.load_model_from_registry',
+            side_effect=lambda name, version: (models[name], {"name": name}),
+        )
+        mocker.patch('src.models.evaluate.mlflow.log_artifact')
+        
+        all_metrics = run_comprehensive_evaluation(
+            pd.DataFrame({"feature": np.arange(n)}),
+            pd.Series(y_true),
+            timestamps,
+            ["good_model", "bad_model"],
+            horizon=1,
+            output_dir=output_dir,
+        )
+        
+        assert list(all_metrics) == ["good_model"]
+        assert "Failed to evaluate bad_model" in capsys.readouterr().out
 
 
 if __name__ == "__main__":
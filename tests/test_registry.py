@@ -1,6 +1,7 @@
 """Tests for PolicyRegistry core functionality."""
 
-import tempfile
+import json
+from collections import Counter
 from pathlib import Path
 from typing import Dict, Any
 
@@ -11,181 +12,191 @@ from egokit.exceptions import RegistryError, ScopeError
 from egokit.models import PolicyCharter, EgoConfig, Severity
 from egokit.registry import PolicyRegistry
 
+from tests.yaml_helpers import YamlDumper
 
-class TestPolicyRegistry:
-    """Test PolicyRegistry core functionality."""
-    
-    @pytest.fixture
-    def temp_registry(self) -> Path:
-        """Create a temporary policy registry for testing."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            registry_path = Path(temp_dir) / ".egokit" / "policy-registry"
-            registry_path.mkdir(parents=True)
-            
-            # Create charter.yaml
-            charter_data = {
-                "version": "1.0.0",
-                "scopes": {
-                    "global": {
-                        "security": [
-                            {
-                                "id": "SEC-001",
-                                "rule": "Never commit secrets to version control",
-                                "severity": "critical",
-                                "detector": "secret.regex.v1",
-                                "auto_fix": False,
-                                "tags": ["security", "credentials"]
-                            }
-                        ],
-                        "code_quality": [
-                            {
-                                "id": "QUAL-001", 
-                                "rule": "Use type hints for all functions",
-                                "severity": "warning",
-                                "detector": "python.ast.typehints.v1",
-                                "auto_fix": True,
-                                "tags": ["python", "typing"]
-                            }
-                        ]
-                    },
-                    "teams/backend": {
-                        "security": [
-                            {
-                                "id": "BACK-001",
-                                "rule": "Validate all database inputs",
-                                "severity": "critical", 
-                                "detector": "sql.injection.v1",
-                                "auto_fix": False,
-                                "tags": ["security", "database"]
-                            }
-                        ]
-                    }
-                },
-                "metadata": {
-                    "description": "Test policy charter",
-                    "maintainer": "Test Team"
-                }
-            }
-            
-            with open(registry_path / "charter.yaml", "w") as f:
-                yaml.dump(charter_data, f)
-            
-            # Create ego configurations
-            ego_dir = registry_path / "ego"
-            ego_dir.mkdir()
-            
-            # Global ego config
-            global_ego = {
-                "version": "1.0.0",
-                "ego": {
-                    "role": "Senior Software Engineer",
-                    "tone": {
-                        "voice": "professional, precise",
-                        "verbosity": "balanced",
-                        "formatting": ["code-with-comments", "bullet-lists"]
-                    },
-                    "defaults": {
-                        "structure": "overview → implementation → validation",
-                        "testing": "unit tests with assertions"
-                    },
-                    "reviewer_checklist": [
-                        "Code follows established patterns",
-                        "Security best practices followed"
-                    ],
-                    "ask_when_unsure": [
-                        "Breaking API changes",
-                        "Security modifications"
-                    ],
-                    "modes": {
-                        "implementer": {
-                            "verbosity": "balanced",
-                            "focus": "clean implementation"
-                        },
-                        "security": {
-                            "verbosity": "detailed", 
-                            "focus": "security implications"
-                        }
-                    }
+CHARTER_DATA = {
+    "version": "1.0.0",
+    "scopes": {
+        "global": {
+            "security": [
+                {
+                    "id": "SEC-001",
+                    "rule": "Never commit secrets to version control",
+                    "severity": "critical",
+                    "detector": "secret.regex.v1",
+                    "auto_fix": False,
+                    "tags": ["security", "credentials"]
                 }
-            }
-            
-            with open(ego_dir / "global.yaml", "w") as f:
-                yaml.dump(global_ego, f)
-            
-            # Team-specific ego config
-            teams_ego = {
-                "version": "1.0.0", 
-                "ego": {
-                    "role": "Backend Engineer",
-                    "tone": {
-                        "voice": "technical, direct",
-                        "verbosity": "detailed"
-                    },
-                    "defaults": {
-                        "structure": "security → implementation → performance"
-                    }
+            ],
+            "code_quality": [
+                {
+                    "id": "QUAL-001", 
+                    "rule": "Use type hints for all functions",
+                    "severity": "warning",
+                    "detector": "python.ast.typehints.v1",
+                    "auto_fix": True,
+                    "tags": ["python", "typing"]
                 }
-            }
-            
-            teams_dir = ego_dir / "teams"
-            teams_dir.mkdir(exist_ok=True)
-            with open(teams_dir / "backend.yaml", "w") as f:
-                yaml.dump(teams_ego, f)
-            
-            # Create schemas directory for validation
-            schemas_dir = registry_path / "schemas"
-            schemas_dir.mkdir()
-            
-            # Create minimal schemas
-            charter_schema = {
-                "$schema": "http://json-schema.org/draft-07/schema#",
-                "type": "object",
-                "required": ["version", "scopes"],
-                "properties": {
-                    "version": {"type": "string"},
-                    "scopes": {"type": "object"}
-                }
-            }
-            
-            import json
-            with open(schemas_dir / "charter.schema.json", "w") as f:
-                json.dump(charter_schema, f)
-            
-            ego_schema = {
-                "$schema": "http://json-schema.org/draft-07/schema#",
-                "type": "object",
-                "properties": {
-                    "version": {"type": "string"},
-                    "ego": {"type": "object"}
+            ]
+        },
+        "teams/backend": {
+            "security": [
+                {
+                    "id": "BACK-001",
+                    "rule": "Validate all database inputs",
+                    "severity": "critical", 
+                    "detector": "sql.injection.v1",
+                    "auto_fix": False,
+                    "tags": ["security", "database"]
                 }
+            ]
+        }
+    },
+    "metadata": {
+        "description": "Test policy charter",
+        "maintainer": "Test Team"
+    }
+}
+
+GLOBAL_EGO_DATA = {
+    "version": "1.0.0",
+    "ego": {
+        "role": "Senior Software Engineer",
+        "tone": {
+            "voice": "professional, precise",
+            "verbosity": "balanced",
+            "formatting": ["code-with-comments", "bullet-lists"]
+        },
+        "defaults": {
+            "structure": "overview → implementation → validation",
+            "testing": "unit tests with assertions"
+        },
+        "reviewer_checklist": [
+            "Code follows established patterns",
+            "Security best practices followed"
+        ],
+        "ask_when_unsure": [
+            "Breaking API changes",
+            "Security modifications"
+        ],
+        "modes": {
+            "implementer": {
+                "verbosity": "balanced",
+                "focus": "clean implementation"
+            },
+            "security": {
+                "verbosity": "detailed", 
+                "focus": "security implications"
             }
-            
-            with open(schemas_dir / "ego.schema.json", "w") as f:
-                json.dump(ego_schema, f)
-            
-            yield registry_path
+        }
+    }
+}
+
+BACKEND_EGO_DATA = {
+    "version": "1.0.0", 
+    "ego": {
+        "role": "Backend Engineer",
+        "tone": {
+            "voice": "technical, direct",
+            "verbosity": "detailed"
+        },
+        "defaults": {
+            "structure": "security → implementation → performance"
+        }
+    }
+}
+
+# Registry fixture files are static, so serialize them once at import
+CHARTER_YAML = yaml.dump(CHARTER_DATA, Dumper=YamlDumper)
+GLOBAL_EGO_YAML = yaml.dump(GLOBAL_EGO_DATA, Dumper=YamlDumper)
+BACKEND_EGO_YAML = yaml.dump(BACKEND_EGO_DATA, Dumper=YamlDumper)
+
+CHARTER_SCHEMA_JSON = json.dumps({
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "required": ["version", "scopes"],
+    "properties": {
+        "version": {"type": "string"},
+        "scopes": {"type": "object"}
+    }
+})
+
+EGO_SCHEMA_JSON = json.dumps({
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "type": "object",
+    "properties": {
+        "version": {"type": "string"},
+        "ego": {"type": "object"}
+    }
+})
+
+
+@pytest.fixture(scope="session")
+def temp_registry(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a temporary policy registry for testing.
+
+    The tests only read the registry, so it is built once per session.
+    """
+    registry_path = tmp_path_factory.mktemp("registry") / ".egokit" / "policy-registry"
+    registry_path.mkdir(parents=True)
+    
+    # Create charter.yaml
+    (registry_path / "charter.yaml").write_text(CHARTER_YAML)
+    
+    # Create ego configurations
+    ego_dir = registry_path / "ego"
+    ego_dir.mkdir()
     
-    def test_load_charter_success(self, temp_registry: Path) -> None:
+    # Global ego config
+    (ego_dir / "global.yaml").write_text(GLOBAL_EGO_YAML)
+    
+    # Team-specific ego config
+    teams_dir = ego_dir / "teams"
+    teams_dir.mkdir(exist_ok=True)
+    (teams_dir / "backend.yaml").write_text(BACKEND_EGO_YAML)
+    
+    # Create schemas directory for validation
+    schemas_dir = registry_path / "schemas"
+    schemas_dir.mkdir()
+    
+    # Create minimal schemas
+    (schemas_dir / "charter.schema.json").write_text(CHARTER_SCHEMA_JSON)
+    (schemas_dir / "ego.schema.json").write_text(EGO_SCHEMA_JSON)
+    
+    return registry_path
+
+
+@pytest.fixture(scope="session")
+def registry(temp_registry: Path) -> PolicyRegistry:
+    """PolicyRegistry over the shared test registry."""
+    return PolicyRegistry(temp_registry)
+
+
+@pytest.fixture(scope="session")
+def charter(registry: PolicyRegistry) -> PolicyCharter:
+    """Charter loaded once from the shared test registry."""
+    return registry.load_charter(validate=False)
+
+
+class TestPolicyRegistry:
+    """Test PolicyRegistry core functionality."""
+    
+    def test_load_charter_success(self, charter: PolicyCharter) -> None:
         """Test successful charter loading."""
-        registry = PolicyRegistry(temp_registry)
-        charter = registry.load_charter(validate=False)
-        
         assert isinstance(charter, PolicyCharter)
         assert charter.version == "1.0.0"
         assert "global" in charter.scopes
         assert "teams/backend" in charter.scopes
     
-    def test_load_charter_missing_file(self) -> None:
+    def test_load_charter_missing_file(self, tmp_path: Path) -> None:
         """Test charter loading with missing file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            registry = PolicyRegistry(Path(temp_dir))
-            
-            with pytest.raises(RegistryError, match="Charter file not found"):
-                registry.load_charter()
+        registry = PolicyRegistry(tmp_path)
+        
+        with pytest.raises(RegistryError, match="Charter file not found"):
+            registry.load_charter()
     
-    def test_load_ego_config_global(self, temp_registry: Path) -> None:
+    def test_load_ego_config_global(self, registry: PolicyRegistry) -> None:
         """Test loading global ego configuration."""
-        registry = PolicyRegistry(temp_registry)
         ego_config = registry.load_ego_config("global", validate=False)
         
         assert isinstance(ego_config, EgoConfig)
@@ -194,54 +205,47 @@ class TestPolicyRegistry:
         assert "implementer" in ego_config.modes
         assert "security" in ego_config.modes
     
-    def test_load_ego_config_team_specific(self, temp_registry: Path) -> None:
+    def test_load_ego_config_team_specific(self, registry: PolicyRegistry) -> None:
         """Test loading team-specific ego configuration."""
-        registry = PolicyRegistry(temp_registry)
         ego_config = registry.load_ego_config("teams/backend", validate=False)
         
         assert ego_config.role == "Backend Engineer"
         assert ego_config.tone.voice == "technical, direct"
         assert ego_config.tone.verbosity == "detailed"
     
-    def test_load_ego_config_missing_file(self, temp_registry: Path) -> None:
+    def test_load_ego_config_missing_file(self, registry: PolicyRegistry) -> None:
         """Test ego config loading with missing file."""
-        registry = PolicyRegistry(temp_registry)
-        
         with pytest.raises(RegistryError, match="Ego config not found"):
             registry.load_ego_config("nonexistent")
     
-    def test_merge_scope_rules_hierarchical(self, temp_registry: Path) -> None:
+    def test_merge_scope_rules_hierarchical(
+        self, registry: PolicyRegistry, charter: PolicyCharter
+    ) -> None:
         """Test merging rules across hierarchical scopes."""
-        registry = PolicyRegistry(temp_registry)
-        charter = registry.load_charter(validate=False)
-        
         # Test global only
         global_rules = registry.merge_scope_rules(charter, ["global"])
         assert len(global_rules) == 2  # SEC-001 and QUAL-001
-        rule_ids = {rule.id for rule in global_rules}
-        assert "SEC-001" in rule_ids
-        assert "QUAL-001" in rule_ids
+        global_by_id = {rule.id: rule for rule in global_rules}
+        assert "SEC-001" in global_by_id
+        assert "QUAL-001" in global_by_id
         
         # Test with team override
         merged_rules = registry.merge_scope_rules(charter, ["global", "teams/backend"])
         assert len(merged_rules) == 3  # SEC-001, QUAL-001, BACK-001
-        rule_ids = {rule.id for rule in merged_rules}
-        assert "SEC-001" in rule_ids
-        assert "QUAL-001" in rule_ids
-        assert "BACK-001" in rule_ids
+        merged_by_id = {rule.id: rule for rule in merged_rules}
+        assert "SEC-001" in merged_by_id
+        assert "QUAL-001" in merged_by_id
+        assert "BACK-001" in merged_by_id
     
-    def test_merge_scope_rules_invalid_scope(self, temp_registry: Path) -> None:
+    def test_merge_scope_rules_invalid_scope(
+        self, registry: PolicyRegistry, charter: PolicyCharter
+    ) -> None:
         """Test merging rules with invalid scope."""
-        registry = PolicyRegistry(temp_registry)
-        charter = registry.load_charter(validate=False)
-        
         with pytest.raises(ScopeError, match="Scope 'invalid' not found"):
             registry.merge_scope_rules(charter, ["global", "invalid"])
     
-    def test_merge_ego_configs_hierarchical(self, temp_registry: Path) -> None:
+    def test_merge_ego_configs_hierarchical(self, registry: PolicyRegistry) -> None:
         """Test merging ego configurations with precedence."""
-        registry = PolicyRegistry(temp_registry)
-        
         # Global only
         global_ego = registry.merge_ego_configs(["global"])
         assert global_ego.role == "Senior Software Engineer"
@@ -256,29 +260,28 @@ class TestPolicyRegistry:
         assert len(merged_ego.reviewer_checklist) == 2  # From global
         assert len(merged_ego.ask_when_unsure) == 2  # From global
     
-    def test_discover_ego_scopes(self, temp_registry: Path) -> None:
+    def test_discover_ego_scopes(self, registry: PolicyRegistry) -> None:
         """Test discovering all available ego scopes."""
-        registry = PolicyRegistry(temp_registry)
         scopes = registry.discover_ego_scopes()
         
         assert "global" in scopes
         assert "teams/backend" in scopes
         assert len(scopes) == 2
         
-    def test_rule_severity_enforcement(self, temp_registry: Path) -> None:
+    def test_rule_severity_enforcement(
+        self, registry: PolicyRegistry, charter: PolicyCharter
+    ) -> None:
         """Test that rule severity levels are properly handled."""
-        registry = PolicyRegistry(temp_registry)
-        charter = registry.load_charter(validate=False)
         rules = registry.merge_scope_rules(charter, ["global", "teams/backend"])
         
-        critical_rules = [r for r in rules if r.severity == Severity.CRITICAL]
-        warning_rules = [r for r in rules if r.severity == Severity.WARNING]
+        by_id = {r.id: r for r in rules}
+        severity_counts = Counter(r.severity for r in rules)
         
-        assert len(critical_rules) == 2  # SEC-001, BACK-001
-        assert len(warning_rules) == 1   # QUAL-001
+        assert severity_counts[Severity.CRITICAL] == 2  # SEC-001, BACK-001
+        assert severity_counts[Severity.WARNING] == 1   # QUAL-001
         
         # Check specific rule properties
-        sec_rule = next(r for r in rules if r.id == "SEC-001")
+        sec_rule = by_id["SEC-001"]
         assert sec_rule.severity == Severity.CRITICAL
         assert sec_rule.auto_fix is False
         assert "security" in sec_rule.tags
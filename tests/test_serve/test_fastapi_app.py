@@ -6,18 +6,93 @@ Tests cover Section 13 FastAPI microservice implementation including
 model loading, prediction endpoints, error handling, and API validation.
 """
 
+import json
+from typing import Any, Dict, Iterator, Optional, Tuple
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from fastapi.testclient import TestClient
+import mlflow.pyfunc
+import mlflow.tracking
 import pandas as pd
 import numpy as np
+from pydantic import ValidationError
+
+from src.serve.fastapi_app import (
+    app,
+    BatchPredictionRequest,
+    ModelManager,
+    PredictionRequest,
+    get_model_manager,
+)
+
+# Canned model outputs; tests only read them
+_PRED_SINGLE = np.array([1234.5])
+_PRED_BATCH = np.array([1234.5, 1456.7])
+
+# Request bodies for the happy-path endpoint tests, encoded once
+_JSON_HEADERS = {"content-type": "application/json"}
+_NOWCAST_BODY = json.dumps(
+    {"features": {"load_lag_1h": 1200.0, "temp_c": 22.5, "hour": 14}}
+).encode()
+_BATCH_NOWCAST_BODY = json.dumps(
+    {"rows": [
+        {"load_lag_1h": 1200.0, "temp_c": 22.5},
+        {"load_lag_1h": 1300.0, "temp_c": 25.0},
+    ]}
+).encode()
+
+
+class FakeModelManager:
+    """Stand-in for ModelManager exposing only what the endpoints use."""
+
+    def __init__(self) -> None:
+        self.model_name = "test-model"
+        self.model_version: Optional[str] = "1"
+        self.model_stage = "Production"
+        self.model_metadata: Dict[str, Any] = {}
+        self.last_loaded = None
+        self.loaded = True
+        self.predictions = _PRED_SINGLE
+        self.load_error: Optional[Exception] = None
+
+    def is_loaded(self) -> bool:
+        return self.loaded
+
+    def predict(self, features_df: pd.DataFrame) -> np.ndarray:
+        return self.predictions
+
+    def load_model(self) -> None:
+        if self.load_error is not None:
+            raise self.load_error
+
+
+@pytest.fixture(scope="session")
+def sample_features_df() -> pd.DataFrame:
+    """Single feature row shared by the ModelManager prediction tests."""
+    return pd.DataFrame({"feature1": [1.0], "feature2": [2.0]})
 
-from src.serve.fastapi_app import app, ModelManager
+
+@pytest.fixture(scope="module")
+def client() -> TestClient:
+    """Create test client shared by the endpoint tests.
+
+    Not entered as a context manager, so the startup hook never tries to
+    load a real model from the registry.
+    """
+    return TestClient(app)
 
 
 class TestModelManager:
     """Test ModelManager functionality."""
 
+    @pytest.fixture
+    def mlflow_mocks(self) -> Iterator[Tuple[Mock, Mock]]:
+        """Patch MLflow model loading and the tracking client."""
+        with patch.object(mlflow.pyfunc, "load_model") as mock_load_model, \
+                patch.object(mlflow.tracking, "MlflowClient") as mock_client_class:
+            yield mock_load_model, mock_client_class
+
     def test_model_manager_init(self) -> None:
         """Test ModelManager initialization."""
         manager = ModelManager("test-model", "Staging")
@@ -28,10 +103,10 @@ class TestModelManager:
         assert manager.model_version is None
         assert not manager.is_loaded()
 
-    @patch('mlflow.pyfunc.load_model')
-    @patch('mlflow.tracking.MlflowClient')
-    def test_load_model_success(self, mock_client_class: Mock, mock_load_model: Mock) -> None:
+    def test_load_model_success(self, mlflow_mocks: Tuple[Mock, Mock]) -> None:
         """Test successful model loading."""
+        mock_load_model, mock_client_class = mlflow_mocks
+        
         # Mock MLflow client
         mock_client = Mock()
         mock_client_class.return_value = mock_client
@@ -58,9 +133,9 @@ class TestModelManager:
         assert manager.model_version == "1"
         assert manager.model_metadata["name"] == "test-model"
 
-    @patch('mlflow.pyfunc.load_model')
-    def test_load_model_failure(self, mock_load_model: Mock) -> None:
+    def test_load_model_failure(self, mlflow_mocks: Tuple[Mock, Mock]) -> None:
         """Test model loading failure."""
+        mock_load_model, _ = mlflow_mocks
         mock_load_model.side_effect = Exception("Model not found")
         
         manager = ModelManager("nonexistent-model")
@@ -68,126 +143,116 @@ class TestModelManager:
         with pytest.raises(RuntimeError, match="Could not load model"):
             manager.load_model()
 
-    def test_predict_without_model(self) -> None:
+    def test_predict_without_model(self, sample_features_df: pd.DataFrame) -> None:
         """Test prediction without loaded model."""
         manager = ModelManager("test-model")
         
         with pytest.raises(RuntimeError, match="Model not loaded"):
-            manager.predict(pd.DataFrame({"feature": [1.0]}))
+            manager.predict(sample_features_df)
 
-    @patch('mlflow.pyfunc.load_model')
-    @patch('mlflow.tracking.MlflowClient')
-    def test_predict_success(self, mock_client_class: Mock, mock_load_model: Mock) -> None:
+    def test_predict_success(
+        self,
+        mlflow_mocks: Tuple[Mock, Mock],
+        sample_features_df: pd.DataFrame,
+    ) -> None:
         """Test successful prediction."""
+        mock_load_model, mock_client_class = mlflow_mocks
+        
         # Setup mocks
         mock_client = Mock()
         mock_client_class.return_value = mock_client
         mock_client.get_latest_versions.return_value = []
         
         mock_model = Mock()
-        mock_model.predict.return_value = np.array([1234.5])
+        mock_model.predict.return_value = _PRED_SINGLE
         mock_load_model.return_value = mock_model
         
         # Test prediction
         manager = ModelManager("test-model")
         manager.load_model()
         
-        features_df = pd.DataFrame({"feature1": [1.0], "feature2": [2.0]})
-        result = manager.predict(features_df)
+        result = manager.predict(sample_features_df)
         
         assert len(result) == 1
         assert result[0] == 1234.5
-        mock_model.predict.assert_called_once_with(features_df)
+        mock_model.predict.assert_called_once_with(sample_features_df)
 
 
 class TestFastAPIEndpoints:
     """Test FastAPI endpoints."""
 
     @pytest.fixture
-    def client(self) -> TestClient:
-        """Create test client."""
-        return TestClient(app)
-
-    @pytest.fixture
-    def mock_model_manager(self) -> Mock:
-        """Create mock model manager."""
-        manager = Mock(spec=ModelManager)
+    def manager(self) -> Iterator[FakeModelManager]:
+        """Fake manager injected in place of the global one."""
+        manager = FakeModelManager()
+        app.dependency_overrides[get_model_manager] = lambda: manager
+        yield manager
+        app.dependency_overrides.pop(get_model_manager, None)
+
+    @pytest.mark.parametrize(
+        "loaded,expected",
+        [
+            pytest.param(
+                True,
+                {"status": "healthy", "model_loaded": True,
+                 "model_name": "test-model", "model_version": "1"},
+                id="healthy",
+            ),
+            pytest.param(
+                False,
+                {"status": "unhealthy", "model_loaded": False,
+                 "model_name": None, "model_version": None},
+                id="unhealthy",
+            ),
+        ],
+    )
+    def test_health_endpoint(
+        self,
+        client: TestClient,
+        manager: FakeModelManager,
+        loaded: bool,
+        expected: Dict[str, Any],
+    ) -> None:
+        """Test health endpoint reports model state."""
+        manager.loaded = loaded
         manager.model_name = "test-model"
         manager.model_version = "1"
-        manager.model_stage = "Production"
-        manager.is_loaded.return_value = True
-        manager.predict.return_value = np.array([1234.5])
-        return manager
-
-    def test_health_endpoint_healthy(self, client: TestClient) -> None:
-        """Test health endpoint with healthy service."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = True
-            mock_manager.model_name = "test-model"
-            mock_manager.model_version = "1"
-            
-            response = client.get("/health")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "healthy"
-            assert data["model_loaded"] is True
-            assert data["model_name"] == "test-model"
-            assert data["model_version"] == "1"
-
-    def test_health_endpoint_unhealthy(self, client: TestClient) -> None:
-        """Test health endpoint with unhealthy service."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = False
-            
-            response = client.get("/health")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "unhealthy"
-            assert data["model_loaded"] is False
-
-    def test_nowcast_endpoint_success(self, client: TestClient) -> None:
+        
+        response = client.get("/health")
+        
+        assert response.status_code == 200
+        data = response.json()
+        for key, value in expected.items():
+            assert data[key] == value
+
+    def test_nowcast_endpoint_success(
+        self, client: TestClient, manager: FakeModelManager
+    ) -> None:
         """Test successful nowcast prediction."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = True
-            mock_manager.model_name = "test-model"
-            mock_manager.model_version = "1"
-            mock_manager.predict.return_value = np.array([1234.5])
-            
-            request_data = {
-                "features": {
-                    "load_lag_1h": 1200.0,
-                    "temp_c": 22.5,
-                    "hour": 14
-                }
-            }
-            
-            response = client.post("/nowcast", json=request_data)
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["prediction"] == 1234.5
-            assert data["model_name"] == "test-model"
-            assert data["model_version"] == "1"
-            assert data["horizon_hours"] == 1
-
-    def test_nowcast_endpoint_model_not_loaded(self, client: TestClient) -> None:
+        manager.loaded = True
+        manager.model_name = "test-model"
+        manager.model_version = "1"
+        manager.predictions = _PRED_SINGLE
+        
+        response = client.post("/nowcast", content=_NOWCAST_BODY, headers=_JSON_HEADERS)
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["prediction"] == 1234.5
+        assert data["model_name"] == "test-model"
+        assert data["model_version"] == "1"
+        assert data["horizon_hours"] == 1
+
+    def test_nowcast_endpoint_model_not_loaded(
+        self, client: TestClient, manager: FakeModelManager
+    ) -> None:
         """Test nowcast with model not loaded."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = False
-            
-            request_data = {
-                "features": {
-                    "load_lag_1h": 1200.0,
-                    "temp_c": 22.5
-                }
-            }
-            
-            response = client.post("/nowcast", json=request_data)
-            
-            assert response.status_code == 503
-            assert "Model not loaded" in response.json()["detail"]
+        manager.loaded = False
+        
+        response = client.post("/nowcast", content=_NOWCAST_BODY, headers=_JSON_HEADERS)
+        
+        assert response.status_code == 503
+        assert "Model not loaded" in response.json()["detail"]
 
     def test_nowcast_endpoint_invalid_features(self, client: TestClient) -> None:
         """Test nowcast with invalid features."""
@@ -210,28 +275,24 @@ class TestFastAPIEndpoints:
         
         assert response.status_code == 422  # Validation error
 
-    def test_batch_nowcast_endpoint_success(self, client: TestClient) -> None:
+    def test_batch_nowcast_endpoint_success(
+        self, client: TestClient, manager: FakeModelManager
+    ) -> None:
         """Test successful batch nowcast prediction."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = True
-            mock_manager.model_name = "test-model"
-            mock_manager.model_version = "1"
-            mock_manager.predict.return_value = np.array([1234.5, 1456.7])
-            
-            request_data = {
-                "rows": [
-                    {"load_lag_1h": 1200.0, "temp_c": 22.5},
-                    {"load_lag_1h": 1300.0, "temp_c": 25.0}
-                ]
-            }
-            
-            response = client.post("/nowcast/batch", json=request_data)
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert len(data["predictions"]) == 2
-            assert data["predictions"] == [1234.5, 1456.7]
-            assert data["count"] == 2
+        manager.loaded = True
+        manager.model_name = "test-model"
+        manager.model_version = "1"
+        manager.predictions = _PRED_BATCH
+        
+        response = client.post(
+            "/nowcast/batch", content=_BATCH_NOWCAST_BODY, headers=_JSON_HEADERS
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["predictions"]) == 2
+        assert data["predictions"] == [1234.5, 1456.7]
+        assert data["count"] == 2
 
     def test_batch_nowcast_endpoint_empty_rows(self, client: TestClient) -> None:
         """Test batch nowcast with empty rows."""
@@ -241,53 +302,62 @@ class TestFastAPIEndpoints:
         
         assert response.status_code == 422  # Validation error
 
-    def test_model_info_endpoint(self, client: TestClient) -> None:
-        """Test model info endpoint."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = True
-            mock_manager.model_metadata = {"name": "test-model", "version": "1"}
-            mock_manager.last_loaded = None
-            mock_manager.model_stage = "Production"
-            
-            response = client.get("/model/info")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["model_metadata"]["name"] == "test-model"
-            assert data["model_stage"] == "Production"
-
-    def test_model_info_endpoint_not_loaded(self, client: TestClient) -> None:
-        """Test model info endpoint with model not loaded."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.is_loaded.return_value = False
-            
-            response = client.get("/model/info")
-            
-            assert response.status_code == 503
-
-    def test_reload_model_endpoint_success(self, client: TestClient) -> None:
+    @pytest.mark.parametrize(
+        "loaded,expected_status,expected_body",
+        [
+            pytest.param(
+                True,
+                200,
+                {"model_metadata": {"name": "test-model", "version": "1"},
+                 "last_loaded": None, "model_stage": "Production"},
+                id="loaded",
+            ),
+            pytest.param(False, 503, {"detail": "Model not loaded"}, id="not_loaded"),
+        ],
+    )
+    def test_model_info_endpoint(
+        self,
+        client: TestClient,
+        manager: FakeModelManager,
+        loaded: bool,
+        expected_status: int,
+        expected_body: Dict[str, Any],
+    ) -> None:
+        """Test model info endpoint with and without a loaded model."""
+        manager.loaded = loaded
+        manager.model_metadata = {"name": "test-model", "version": "1"}
+        manager.last_loaded = None
+        manager.model_stage = "Production"
+        
+        response = client.get("/model/info")
+        
+        assert response.status_code == expected_status
+        assert response.json() == expected_body
+
+    def test_reload_model_endpoint_success(
+        self, client: TestClient, manager: FakeModelManager
+    ) -> None:
         """Test successful model reload."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.load_model.return_value = None
-            mock_manager.model_name = "test-model"
-            mock_manager.model_version = "2"
-            
-            response = client.post("/model/reload")
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "success"
-            assert "reloaded successfully" in data["message"]
-
-    def test_reload_model_endpoint_failure(self, client: TestClient) -> None:
+        manager.model_name = "test-model"
+        manager.model_version = "2"
+        
+        response = client.post("/model/reload")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "success"
+        assert "reloaded successfully" in data["message"]
+
+    def test_reload_model_endpoint_failure(
+        self, client: TestClient, manager: FakeModelManager
+    ) -> None:
         """Test model reload failure."""
-        with patch('src.serve.fastapi_app.model_manager') as mock_manager:
-            mock_manager.load_model.side_effect = Exception("Reload failed")
-            
-            response = client.post("/model/reload")
-            
-            assert response.status_code == 500
-            assert "Model reload failed" in response.json()["detail"]
+        manager.load_error = Exception("Reload failed")
+        
+        response = client.post("/model/reload")
+        
+        assert response.status_code == 500
+        assert "Model reload failed" in response.json()["detail"]
 
 
 class TestRequestValidation:
@@ -295,8 +365,6 @@ class TestRequestValidation:
 
     def test_prediction_request_validation(self) -> None:
         """Test PredictionRequest validation."""
-        from src.serve.fastapi_app import PredictionRequest
-        
         # Valid request
         valid_data = {"features": {"load_lag_1h": 1200.0, "temp_c": 22.5}}
         request = PredictionRequest(**valid_data)
@@ -307,14 +375,11 @@ class TestRequestValidation:
             PredictionRequest(features={})
         
         # Invalid request - non-numeric feature
-        from pydantic import ValidationError
         with pytest.raises(ValidationError):
             PredictionRequest(features={"load_lag_1h": "invalid"})
 
     def test_batch_prediction_request_validation(self) -> None:
         """Test BatchPredictionRequest validation."""
-        from src.serve.fastapi_app import BatchPredictionRequest
-        
         # Valid request
         valid_data = {
             "rows": [
@@ -326,7 +391,6 @@ class TestRequestValidation:
         assert len(request.rows) == 2
         
         # Invalid request - empty rows
-        from pydantic import ValidationError
         with pytest.raises(ValidationError):
             BatchPredictionRequest(rows=[])
         
@@ -0,0 +1,7 @@
+"""YAML helpers shared by the EgoKit registry and artifact tests."""
+
+import yaml
+
+# Prefer the libyaml-backed implementations when PyYAML was built with them
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)